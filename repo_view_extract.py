@@ -5,20 +5,106 @@ import os
 import string
 import random
 import re
+import bisect
+from array import array
 from pathlib import Path
 import threading
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from operator import itemgetter
 from typing import List, Dict, Optional, Any, Set
 
+try:
+    import ijson  # Optional: incremental parsing of large JSON arrays
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster parsing of JSON Lines records
+
+    def _json_loads(data: bytes) -> Any:
+        """Parse with orjson, retrying with json for what it rejects (e.g. NaN/Infinity)."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+except ImportError:
+    _json_loads = json.loads
+
+
+class FolderRecord:
+    """Compact record for a file found by a folder scan.
+
+    Only the per-file values are stored; the placeholder metadata shared by
+    every scanned file lives on the class. Supports the read-only subset of
+    the dict interface used for JSON records (get, [], in).
+    """
+
+    __slots__ = ('repo_name', 'path', 'abs_path', 'size')
+
+    DEFAULTS = {
+        'license': 'N/A',
+        'copies': 1,
+        'hash': '',
+        'line_mean': 0,
+        'line_max': 0,
+        'alpha_frac': 0,
+        'autogenerated': False
+    }
+
+    def __init__(self, repo_name: str, path: str, abs_path: str, size: int):
+        self.repo_name = repo_name
+        self.path = path
+        self.abs_path = abs_path
+        self.size = size
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return self.DEFAULTS.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return self.DEFAULTS[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ or key in self.DEFAULTS
+
+
 class JSONCodeViewer(tk.Tk):
     """Professional JSON Code Repository Viewer with bug fixes and improvements."""
 
     # Class constants
     RECORDS_PER_PAGE = 50
+    # Sortable tree columns backed by record_cache: column -> (cache field, default)
+    CACHE_SORT_FIELDS = {
+        'type': ('type_str', ''),
+        'quality': ('quality_score', 0),
+    }
     DEFAULT_GEOMETRY = "1400x900"
     MIN_SIZE = (1000, 600)
     MAX_FILE_SIZE = 2 * 1024 * 1024 * 1024  # 2GB limit
+    READ_BUFFER_SIZE = 64 * 1024  # Buffer for streaming large JSON files
+    PROGRESS_POLL_MS = 200  # UI-thread polling interval for worker progress
+    PREVIEW_DEBOUNCE_MS = 250  # Quiet period before the filter preview recalculates
+    SEARCH_DEBOUNCE_MS = 150  # Quiet period before the search match count updates
+    SEARCH_SEPARATOR = '\0'  # Joins a search column's values into one string
+    EXPORT_WORKERS = 8  # Concurrent file writes during export
+    EXPORT_BATCH_SIZE = 128  # Records named and written per export batch
     MAX_FILENAME_LENGTH = 255  # Windows filename limit
     RANDOM_FILENAME_LENGTH = 12
+    SCAN_CHUNK_SIZE = 500  # Records per background T2 scan chunk
+    MAX_SCAN_FILE_SIZE = 10 * 1024 * 1024  # Skip larger files in folder scans
+    SKIP_DIRS = {'__pycache__', 'venv', 'env', '.git', 'node_modules'}
+    CONTENT_CACHE_SIZE = 256  # Folder file contents kept in memory at once
+    HIGHLIGHT_CACHE_SIZE = 128  # Highlighted code buffers whose tag ranges are kept
+    # Invalid filename characters become '_', control characters are dropped
+    FILENAME_TRANSLATION = str.maketrans({
+        **{c: '_' for c in '<>:"/\\|?*'},
+        **{i: None for i in range(32)}
+    })
 
     # Python keywords for syntax highlighting
     PYTHON_KEYWORDS = {
@@ -29,6 +115,17 @@ class JSONCodeViewer(tk.Tk):
         'while', 'with', 'yield'
     }
 
+    # Single-pass syntax highlighter: each named group is a text tag. Earlier
+    # alternatives win, so keywords and numbers inside strings or comments
+    # are not tagged separately.
+    HIGHLIGHT_RE = re.compile(
+        r'(?P<comment>#[^\n]*)'
+        r'|(?P<string>"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"[^"\n]*"|\'[^\'\n]*\')'
+        r'|(?P<decorator>@\w+)'
+        r'|(?P<number>\b\d+\.?\d*\b)'
+        r'|(?P<keyword>\b(?:' + '|'.join(sorted(PYTHON_KEYWORDS)) + r')\b)'
+    )
+
     # Code type detection patterns
     CODE_TYPE_PATTERNS = {
         'GUI': {
@@ -36,7 +133,7 @@ class JSONCodeViewer(tk.Tk):
             'path_keywords': ['gui', 'ui', 'interface', 'window', 'dialog', 'widget']
         },
         'AI/ML': {
-            'imports': ['tensorflow', 'keras', 'torch', 'pytorch', 'sklearn', 'scikit-learn', 'xgboost',
+            'imports': ['tensorflow', 'keras', 'torch', 'torchvision', 'torchaudio', 'pytorch', 'sklearn', 'scikit-learn', 'xgboost',
                         'lightgbm', 'catboost', 'transformers', 'huggingface', 'openai', 'langchain'],
             'path_keywords': ['ai', 'ml', 'machine_learning', 'deep_learning', 'neural', 'model', 'training']
         },
@@ -79,6 +176,22 @@ class JSONCodeViewer(tk.Tk):
         }
     }
 
+    # Inverted index of CODE_TYPE_PATTERNS imports, matched in a single regex scan.
+    # A name may be followed by digits or '_' (PyQt5, tensorflow_hub) but not by
+    # more letters, so 'glob' does not match 'global'.
+    IMPORT_TO_TYPE = {
+        imp.lower(): type_name
+        for type_name, patterns in CODE_TYPE_PATTERNS.items()
+        for imp in patterns['imports']
+    }
+    IMPORT_RE = re.compile(
+        r'\b(' + '|'.join(map(re.escape, sorted(IMPORT_TO_TYPE, key=len, reverse=True))) + r')(?![a-z])'
+    )
+    # Bytes variants for raw folder files that have not been decoded
+    IMPORT_BYTES_TO_TYPE = {imp.encode(): type_name for imp, type_name in IMPORT_TO_TYPE.items()}
+    IMPORT_BYTES_RE = re.compile(IMPORT_RE.pattern.encode())
+    TYPE_SCAN_CHARS = 8192  # Imports live at the top; only scan the head of a file
+
     # Size filter options (in bytes)
     SIZE_OPTIONS = [
         ('1 KB', 1024),
@@ -86,8 +199,8 @@ class JSONCodeViewer(tk.Tk):
         ('10 KB', 10 * 1024),
         ('20 KB', 20 * 1024),
         ('30 KB', 30 * 1024),
-        ('50 KB', 10 * 1024),
-        ('75 KB', 75* 1024),
+        ('50 KB', 50 * 1024),
+        ('75 KB', 75 * 1024),
         ('100 KB', 100 * 1024),
         ('200 KB', 200 * 1024),
         ('300 KB', 300 * 1024),
@@ -98,6 +211,7 @@ class JSONCodeViewer(tk.Tk):
         ('10 MB', 10 * 1024 * 1024),
         ('100 MB', 100 * 1024 * 1024)
     ]
+    SIZE_OPTIONS_MAP = dict(SIZE_OPTIONS)  # Label -> bytes
     # Quality score weights
     QUALITY_WEIGHTS = {
         'has_docstring': 10,
@@ -114,6 +228,19 @@ class JSONCodeViewer(tk.Tk):
         'no_magic_numbers': 2,
     }
     MAX_QUALITY_SCORE = sum(QUALITY_WEIGHTS.values())
+    QUALITY_MEMO_SIZE = 8192  # Memoized quality results per tier before reset
+    # Substrings tested by calculate_basic_quality, for str and raw bytes content
+    BASIC_QUALITY_NEEDLES = {n: n for n in (
+        '"""', "'''", ': ', '->', 'from ', 'import *', 'def ', 'class ', 'eval(', 'exec(')}
+    BASIC_QUALITY_NEEDLES_BYTES = {n: n.encode() for n in BASIC_QUALITY_NEEDLES}
+
+    # Per-line quality metrics, each counted in one C-level regex pass
+    # One match per non-blank line: (indentation, '#' if it is a comment line)
+    LINE_START_RE = re.compile(r'^([^\S\n]*)(?=\S)(#?)', re.MULTILINE)
+    LONG_LINE_RE = re.compile(r'^[^\n]{121}', re.MULTILINE)  # Lines over 120 chars
+    TYPE_HINT_RE = re.compile(r'def \w+\([^)]*:\s*\w+')
+    IDENTIFIER_RE = re.compile(r'\b([a-z_][a-z0-9_]*)\b', re.I)
+    MAGIC_NUMBER_RE = re.compile(r'[^0-9_]([2-9]\d{2,}|[1-9]\d{3,})[^0-9_]')
     def __init__(self):
         super().__init__()
 
@@ -124,11 +251,35 @@ class JSONCodeViewer(tk.Tk):
         # Data storage
         self.records: List[Dict[str, Any]] = []
         self.filtered_indices: List[int] = []
+        self.filtered_positions: Dict[int, int] = {}  # record index -> position in filtered_indices
+        self.visible_row_values: Dict[str, tuple] = {}  # Tree item id -> displayed row values
+        # Line-number gutter: shown line count, and the longest gutter text built so far
+        self.displayed_line_count: int = 0
+        self.displayed_code_key: Optional[tuple] = None  # (hash, len, highlighted) of the shown code
+        self.line_number_cache: str = ""
+        self.line_number_count: int = 0
+        self.highlight_token: int = 0  # Bumped per display; stale highlight results are ignored
+        # Highlight ranges of recently shown code, keyed by (hash(code), len(code)), LRU order
+        self.highlight_cache: 'OrderedDict[tuple, Dict[str, List[str]]]' = OrderedDict()
+        self.sizes = array('q')  # Per-record size column, parallel to self.records
+        self.size_order: List[int] = []  # Record indices ordered by size
+        self.sorted_sizes = array('q')  # self.sizes in size_order, for bisect
+        self.sort_names: List[str] = []  # Lower-cased display names for sorting
+        self.paths: List[str] = []  # Per-record path column ('' when missing)
+        self.locs = array('q')  # Per-record LOC column, filled in by the T2 scan (0 until then)
+        self.licenses: List[str] = []  # Per-record license column
+        self.extensions: List[str] = []  # Per-record lower-cased file extension column
+        # (total_size, top licenses, top extensions) for the statistics dialog, per load
+        self.stats_summary: Optional[tuple] = None
         self.current_record_index: int = 0
         self.current_page: int = 0
         self.total_pages: int = 1
         self.file_path: Optional[str] = None
-        self.loading_cancelled: bool = False
+        self.loading_cancelled = threading.Event()
+        # Latest worker progress, applied by the UI-thread pollers
+        self.load_progress: Optional[tuple] = None  # (percent, message)
+        self.scan_progress: Optional[tuple] = None  # (done, total)
+        self.load_poll_id: Optional[str] = None  # Pending poll_load_progress() callback
         self.is_filtered: bool = False  # Track if filter is active
         self.current_search_term: str = ""  # Track current search term
         self.filter_types: Set[str] = set()
@@ -136,8 +287,20 @@ class JSONCodeViewer(tk.Tk):
         self.filter_min_size: str = "1 KB"
         self.filter_max_size: str = "100 MB"
         self.record_cache: Dict[int, Dict[str, Any]] = {}
+        # Inverted index of T2 type detection: type name -> record indices
+        self.type_postings: Dict[str, Set[int]] = defaultdict(set)
+        self.type_index_complete: bool = False  # Every record has been indexed
+        self.quality_generation: int = 0  # Bumped when a T3 score replaces a T2 one
+        # Search projections of metadata fields: (field, case-folded) -> get_search_column() result
+        self.search_columns: Dict[tuple, tuple] = {}
+        # Lazily read folder file contents, least recently used first
+        self.content_cache: 'OrderedDict[int, str]' = OrderedDict()
         self.background_scan_active: bool = False
         self.background_scan_cancel: bool = False
+        self.scan_generation: int = 0  # Bumped per scan; older scans stop without finishing
+        # Quality results keyed by (hash(content), len(content))
+        self.basic_quality_memo: Dict[tuple, int] = {}
+        self.full_quality_memo: Dict[tuple, Dict[str, bool]] = {}
 
 
         # Setup GUI
@@ -518,12 +681,7 @@ class JSONCodeViewer(tk.Tk):
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Remove or replace invalid characters from filename."""
-        invalid_chars = r'<>:"/\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        filename = ''.join(c for c in filename if ord(c) >= 32)
-        filename = filename.strip('. ')
-        return filename
+        return filename.translate(JSONCodeViewer.FILENAME_TRANSLATION).strip('. ')
 
     def create_safe_filename(self, original_path: str, index: int = 0) -> str:
         """Create a safe filename from the original path."""
@@ -549,13 +707,23 @@ class JSONCodeViewer(tk.Tk):
         return filename
 
     def create_safe_export_path(self, folder: str, original_path: str,
-                                index: int, used_names: Set[str]) -> str:
-        """Create a safe, unique export path for a file."""
+                                index: int, used_names: Dict[str, int]) -> str:
+        """Create a safe, unique export path for a file.
+
+        used_names maps each lower-cased name already taken to the next
+        suffix counter to try, so repeated names resume probing where the
+        previous duplicate stopped.
+        """
         safe_name = self.create_safe_filename(original_path, index)
+        key = safe_name.lower()
+
+        if key not in used_names:
+            used_names[key] = 1
+            return os.path.join(folder, safe_name)
 
         base_name, ext = os.path.splitext(safe_name)
+        counter = used_names[key]
         final_name = safe_name
-        counter = 1
 
         while final_name.lower() in used_names:
             new_name = f"{base_name}_{counter}{ext}"
@@ -567,7 +735,8 @@ class JSONCodeViewer(tk.Tk):
                 final_name = new_name
             counter += 1
 
-        used_names.add(final_name.lower())
+        used_names[key] = counter
+        used_names[final_name.lower()] = 1
         return os.path.join(folder, final_name)
 
     def open_file(self):
@@ -592,7 +761,8 @@ class JSONCodeViewer(tk.Tk):
             return
 
         self.file_path = file_path
-        self.loading_cancelled = False
+        self.loading_cancelled.clear()
+        self.stop_background_scan()  # Its indices refer to the records being replaced
         self.update_status("Loading file...")
         self.show_progress_bar()
         self.hide_filter_indicator()  # Clear any existing filter
@@ -609,7 +779,8 @@ class JSONCodeViewer(tk.Tk):
             return
 
         self.file_path = folder_path
-        self.loading_cancelled = False
+        self.loading_cancelled.clear()
+        self.stop_background_scan()  # Its indices refer to the records being replaced
         self.update_status("Scanning folder...")
         self.show_progress_bar()
         self.hide_filter_indicator()
@@ -624,64 +795,53 @@ class JSONCodeViewer(tk.Tk):
             self.records = []
             repo_name = os.path.basename(folder_path)
 
+            # (path, size) pairs; scandir entries carry the stat from the directory read
             py_files = []
-            for root, dirs, files in os.walk(folder_path):
-                if self.loading_cancelled:
+            pending_dirs = [folder_path]
+            while pending_dirs:
+                if self.loading_cancelled.is_set():
                     self.after(0, lambda: self.update_status("Scanning cancelled"))
                     self.after(0, self.hide_progress_bar)
                     return
 
-                dirs[:] = [d for d in dirs if
-                           not d.startswith('.') and d not in ('__pycache__', 'venv', 'env', '.git', 'node_modules')]
+                sub_dirs = []
+                try:
+                    with os.scandir(pending_dirs.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir():
+                                if (not entry.is_symlink() and not entry.name.startswith('.')
+                                        and entry.name not in self.SKIP_DIRS):
+                                    sub_dirs.append(entry.path)
+                            elif entry.name.endswith('.py'):
+                                try:
+                                    file_size = entry.stat().st_size
+                                except OSError:
+                                    continue
+                                if file_size <= self.MAX_SCAN_FILE_SIZE:
+                                    py_files.append((entry.path, file_size))
+                except OSError:
+                    continue
 
-                for file in files:
-                    if file.endswith('.py'):
-                        py_files.append(os.path.join(root, file))
+                # Reversed so directories are visited in listing order
+                pending_dirs.extend(reversed(sub_dirs))
 
             total_files = len(py_files)
             self.update_status(f"Found {total_files} Python files. Loading...")
 
-            for i, file_path in enumerate(py_files):
-                if self.loading_cancelled:
+            # Contents are read on demand by get_record_content()
+            for i, (file_path, file_size) in enumerate(py_files):
+                if (i & 63) == 0 and self.loading_cancelled.is_set():
                     self.after(0, lambda: self.update_status("Loading cancelled"))
                     self.after(0, self.hide_progress_bar)
                     return
 
-                try:
-                    file_size = os.path.getsize(file_path)
-
-                    if file_size > 10 * 1024 * 1024:
-                        continue
-
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-
-                    rel_path = os.path.relpath(file_path, folder_path)
-
-                    record = {
-                        'repo_name': repo_name,
-                        'path': rel_path,
-                        'size': file_size,
-                        'content': content,
-                        'license': 'N/A',
-                        'copies': 1,
-                        'hash': '',
-                        'line_mean': 0,
-                        'line_max': 0,
-                        'alpha_frac': 0,
-                        'autogenerated': False
-                    }
-
-                    self.records.append(record)
-
-                except (IOError, OSError, UnicodeDecodeError) as e:
-                    print(f"Error reading {file_path}: {e}")
-                    continue
+                rel_path = os.path.relpath(file_path, folder_path)
+
+                self.records.append(FolderRecord(repo_name, rel_path, file_path, file_size))
 
                 if i % 50 == 0:
-                    progress = (i / total_files) * 100
-                    self.after(0, lambda p=progress: self.progress_var.set(p))
-                    self.update_status(f"Loading... {i}/{total_files} files")
+                    self.report_progress((i / total_files) * 100,
+                                         f"Loading... {i}/{total_files} files")
 
             self.after(0, self.on_file_loaded)
 
@@ -691,14 +851,87 @@ class JSONCodeViewer(tk.Tk):
             self.after(0, self.hide_progress_bar)
 
 
+    @staticmethod
+    def read_source_file(file_path: str) -> Optional[bytes]:
+        """Read a file as raw bytes, returning None if it cannot be read."""
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def decode_source(raw: bytes) -> str:
+        """Decode file bytes as UTF-8 with universal newlines."""
+        content = raw.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def get_record_content(self, record_idx: int, cache: bool = True) -> str:
+        """Return a record's code, reading folder files from disk on demand.
+
+        Only the UI thread should pass cache=True; background workers read
+        without touching content_cache.
+        """
+        record = self.records[record_idx]
+        if not isinstance(record, FolderRecord):
+            return record.get('content', '')
+
+        content = self.content_cache.get(record_idx)
+        if content is not None:
+            if cache:
+                self.content_cache.move_to_end(record_idx)
+            return content
+
+        raw = self.read_source_file(record.abs_path)
+        content = self.decode_source(raw) if raw is not None else ''
+
+        if cache:
+            self.content_cache[record_idx] = content
+            if len(self.content_cache) > self.CONTENT_CACHE_SIZE:
+                self.content_cache.popitem(last=False)
+        return content
+
+    def get_scan_content(self, record_idx: int) -> Any:
+        """Content as the T2 scan sees it: raw bytes for folder files, text otherwise.
+
+        The filter preview classifies unscanned records from the same input, so
+        TYPE_SCAN_CHARS and line endings are counted alike on both paths.
+        """
+        record = self.records[record_idx]
+        if isinstance(record, FolderRecord):
+            return self.read_source_file(record.abs_path) or b''
+        return record.get('content', '')
+
     def show_progress_bar(self):
         """Show the progress bar."""
         self.progress_var.set(0)
         self.progress_bar.pack(side='right', padx=5)
+        self.load_progress = None
+        if self.load_poll_id is None:
+            self.load_poll_id = self.after(self.PROGRESS_POLL_MS, self.poll_load_progress)
 
     def hide_progress_bar(self):
         """Hide the progress bar."""
         self.progress_bar.pack_forget()
+        if self.load_poll_id is not None:
+            self.after_cancel(self.load_poll_id)
+            self.load_poll_id = None
+
+    def report_progress(self, progress: float, message: str):
+        """Record progress from a worker; poll_load_progress puts it on screen."""
+        self.load_progress = (progress, message)
+
+    def poll_load_progress(self):
+        """Apply the latest loader progress while the progress bar is shown."""
+        latest, self.load_progress = self.load_progress, None
+        if latest is not None:
+            progress, message = latest
+            self.progress_var.set(progress)
+            self.status_bar.config(text=message)
+        self.load_poll_id = self.after(self.PROGRESS_POLL_MS, self.poll_load_progress)
 
     def load_json_file(self, file_path: str):
         """Load JSON file (runs in background thread)."""
@@ -710,11 +943,30 @@ class JSONCodeViewer(tk.Tk):
 
             self.records = []
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                first_char = f.read(1)
+            with open(file_path, 'rb', buffering=self.READ_BUFFER_SIZE) as f:
+                # Sniff the first non-whitespace byte: '[' means a JSON array
+                first_char = f.read(64).lstrip()[:1]
                 f.seek(0)
 
-                if first_char == '[':
+                if first_char == b'[' and ijson is not None:
+                    try:
+                        items = ijson.items(f, 'item', use_float=True)
+                        for count, record in enumerate(items, 1):
+                            if (count & 63) == 0 and self.loading_cancelled.is_set():
+                                self.after(0, lambda: self.update_status("Loading cancelled"))
+                                return
+
+                            self.records.append(record)
+
+                            if count % 500 == 0:
+                                self.report_progress((f.tell() / file_size) * 100,
+                                                     f"Loading... {count} records")
+                    except ijson.JSONError:
+                        # Some backends reject NaN/Infinity or integers above 64 bits; json accepts them
+                        f.seek(0)
+                        data = json.load(f)
+                        self.records = data if isinstance(data, list) else [data]
+                elif first_char == b'[':
                     data = json.load(f)
                     self.records = data if isinstance(data, list) else [data]
                 else:
@@ -724,24 +976,23 @@ class JSONCodeViewer(tk.Tk):
 
                     bytes_read = 0
                     for line_num, line in enumerate(f, 1):
-                        if self.loading_cancelled:
+                        if (line_num & 63) == 0 and self.loading_cancelled.is_set():
                             self.after(0, lambda: self.update_status("Loading cancelled"))
                             return
 
-                        bytes_read += len(line.encode('utf-8'))
+                        bytes_read += len(line)
                         line = line.strip()
 
                         if line:
                             try:
-                                record = json.loads(line)
+                                record = _json_loads(line)
                                 self.records.append(record)
-                            except json.JSONDecodeError as e:
+                            except ValueError as e:
                                 print(f"Error parsing line {line_num}: {e}")
 
                         if line_num % 500 == 0:
-                            progress = (bytes_read / total_size) * 100
-                            self.after(0, lambda p=progress: self.progress_var.set(p))
-                            self.update_status(f"Loading... {line_num} records")
+                            self.report_progress((bytes_read / total_size) * 100,
+                                                 f"Loading... {line_num} records")
 
             self.after(0, self.on_file_loaded)
 
@@ -755,6 +1006,8 @@ class JSONCodeViewer(tk.Tk):
         """Called after file is loaded."""
         self.hide_progress_bar()
 
+        self.build_record_columns()
+        self.content_cache.clear()
         self.filtered_indices = list(range(len(self.records)))
         self.update_pagination()
 
@@ -773,10 +1026,91 @@ class JSONCodeViewer(tk.Tk):
         self.load_page()
         self.update_status(f"Loaded {len(self.records)} records successfully")
         self.record_cache.clear()
+        self.type_postings.clear()
+        self.type_index_complete = False
+        self.search_columns.clear()
         self.start_background_scan()
 
+    @staticmethod
+    def parse_size(value: Any) -> int:
+        """Convert a record's size field to int bytes (0 if missing or invalid)."""
+        try:
+            return int(value or 0)
+        except (ValueError, TypeError):
+            return 0
+
+    def build_record_columns(self):
+        """Build column arrays over self.records for fast filtering and sorting."""
+        parse_size = self.parse_size
+        sizes = array('q', (parse_size(r.get('size', 0)) for r in self.records))
+        self.sizes = sizes
+        self.size_order = sorted(range(len(sizes)), key=sizes.__getitem__)
+        self.sorted_sizes = array('q', (sizes[i] for i in self.size_order))
+
+        self.paths = [str(r.get('path') or '') for r in self.records]
+        self.locs = array('q', [0]) * len(self.records)
+        self.licenses = [str(r.get('license', 'unknown')) for r in self.records]
+        splitext = os.path.splitext
+        self.extensions = [splitext(path)[1].lower() or 'no extension' for path in self.paths]
+        self.stats_summary = None
+
+        self.sort_names = [
+            os.path.basename(path).lower() if path else f'record_{i}'
+            for i, path in enumerate(self.paths)
+        ]
+
+    def indices_in_size_range(self, min_bytes: float, max_bytes: float) -> List[int]:
+        """Record indices with min_bytes <= size <= max_bytes, in record order."""
+        lo = bisect.bisect_left(self.sorted_sizes, min_bytes)
+        hi = bisect.bisect_right(self.sorted_sizes, max_bytes)
+        return sorted(self.size_order[lo:hi])
+
+    def get_search_column(self, field: str, fold: bool) -> tuple:
+        """(values, joined, starts) search projection of a record field, built once per load.
+
+        joined is every value separated by SEARCH_SEPARATOR and starts[i] is
+        the offset of value i in it (with a final end offset), so a substring
+        search can run over the whole column in C.
+        """
+        key = (field, fold)
+        column = self.search_columns.get(key)
+        if column is None:
+            if field == 'path':
+                values = self.paths  # Already projected by build_record_columns()
+            else:
+                values = [str(r.get(field, '')) for r in self.records]
+            if fold:
+                values = [v.casefold() for v in values]
+            starts = array('q', [0])
+            starts.extend(accumulate(len(v) + 1 for v in values))
+            column = self.search_columns[key] = (values, self.SEARCH_SEPARATOR.join(values), starts)
+        return column
+
+    def search_column_matches(self, column: tuple, term: str) -> List[int]:
+        """Indices of the values in a search column that contain term."""
+        values, joined, starts = column
+        if self.SEARCH_SEPARATOR in term or joined.count(term) > len(values) // 8:
+            # Common terms: one test per value beats one find() per hit
+            return [i for i, value in enumerate(values) if term in value]
+
+        # Rare terms: let find() skip over non-matching values in C
+        matches = []
+        find = joined.find
+        bisect_right = bisect.bisect_right
+        pos = find(term)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            matches.append(i)
+            pos = find(term, starts[i + 1])
+        return matches
+
+    def update_filtered_positions(self):
+        """Rebuild the record index -> filtered position lookup."""
+        self.filtered_positions = {idx: pos for pos, idx in enumerate(self.filtered_indices)}
+
     def update_pagination(self):
         """Update pagination values safely."""
+        self.update_filtered_positions()
         total = len(self.filtered_indices)
         if total == 0:
             self.total_pages = 1
@@ -788,8 +1122,10 @@ class JSONCodeViewer(tk.Tk):
 
     def load_page(self):
         """Load current page of records into treeview."""
-        for item in self.records_tree.get_children():
-            self.records_tree.delete(item)
+        children = self.records_tree.get_children()
+        if children:
+            self.records_tree.delete(*children)
+        self.visible_row_values.clear()
 
         if not self.filtered_indices:
             if self.is_filtered:
@@ -808,20 +1144,24 @@ class JSONCodeViewer(tk.Tk):
         start_idx = self.current_page * self.RECORDS_PER_PAGE
         end_idx = min(start_idx + self.RECORDS_PER_PAGE, len(self.filtered_indices))
 
-        for i in range(start_idx, end_idx):
-            record_idx = self.filtered_indices[i]
-            record = self.records[record_idx]
-            cache = self.get_cached_metrics(record_idx)
-
-            name = cache.get('name', 'Unknown')
-            size_str = cache.get('size_str', '?')
-            loc = cache.get('loc', '?')
-            code_type = cache.get('type_str', '...')
-            quality = cache.get('quality_str', '...')
-
-            self.records_tree.insert('', 'end', iid=str(record_idx), values=(
-                name, size_str, loc, code_type, quality
-            ))
+        # Detach the tree during the bulk insert so it is laid out once
+        self.records_tree.pack_forget()
+        try:
+            for i in range(start_idx, end_idx):
+                record_idx = self.filtered_indices[i]
+                cache = self.get_cached_metrics(record_idx)
+
+                name = cache.get('name', 'Unknown')
+                size_str = cache.get('size_str', '?')
+                loc = cache.get('loc', '?')
+                code_type = cache.get('type_str', '...')
+                quality = cache.get('quality_str', '...')
+
+                values = (name, size_str, loc, code_type, quality)
+                self.records_tree.insert('', 'end', iid=str(record_idx), values=values)
+                self.visible_row_values[str(record_idx)] = values
+        finally:
+            self.records_tree.pack(side='left', fill='both', expand=True)
 
         filter_info = ""
         if self.is_filtered:
@@ -841,6 +1181,8 @@ class JSONCodeViewer(tk.Tk):
         """Clear the metadata and code display."""
         self.set_text_widget(self.metadata_text, "")
         self.set_text_widget(self.code_text, "")
+        self.displayed_code_key = None
+        self.displayed_line_count = 0
         self.set_text_widget(self.line_numbers, "")
 
     def set_text_widget(self, widget: tk.Text, content: str,
@@ -869,8 +1211,7 @@ class JSONCodeViewer(tk.Tk):
         if record_idx >= len(self.records):
             return
 
-        self.current_record_index = self.filtered_indices.index(
-            record_idx) if record_idx in self.filtered_indices else 0
+        self.current_record_index = self.filtered_positions.get(record_idx, 0)
         record = self.records[record_idx]
 
         cache = self.get_cached_metrics(record_idx)
@@ -899,7 +1240,7 @@ Copies: {record.get('copies', 'N/A')}"""
 
         self.set_text_widget(self.metadata_text, metadata_info)
 
-        content = record.get('content', '')
+        content = self.get_record_content(record_idx)
         self.display_code(content)
 
         self.update_status(
@@ -912,19 +1253,28 @@ Copies: {record.get('copies', 'N/A')}"""
             return
 
         record_idx = self.filtered_indices[self.current_record_index]
-        record = self.records[record_idx]
-        content = record.get('content', '')
+        content = self.get_record_content(record_idx)
         self.display_code(content)
 
     def display_code(self, code: str):
         """Display code with line numbers and optional syntax highlighting."""
+        # Same code with the same highlighting is already on screen: just scroll to the top
+        display_key = (hash(code), len(code), bool(code) and self.syntax_highlight_var.get())
+        if display_key == self.displayed_code_key:
+            self.code_text.yview_moveto(0)
+            self.line_numbers.yview_moveto(0)
+            return
+        self.displayed_code_key = display_key
+
+        self.highlight_token += 1  # Drop highlighting still pending for the previous code
         self.code_text.config(state='normal')
         self.line_numbers.config(state='normal')
 
         self.code_text.delete('1.0', 'end')
-        self.line_numbers.delete('1.0', 'end')
 
         if not code:
+            self.line_numbers.delete('1.0', 'end')
+            self.displayed_line_count = 0
             self.code_text.config(state='disabled')
             self.line_numbers.config(state='disabled')
             return
@@ -934,9 +1284,12 @@ Copies: {record.get('copies', 'N/A')}"""
         if self.syntax_highlight_var.get():
             self.apply_syntax_highlighting()
 
+        # The gutter only depends on the line count; leave it alone if unchanged
         num_lines = int(self.code_text.index('end-1c').split('.')[0])
-        line_nums = '\n'.join(str(i) for i in range(1, num_lines + 1))
-        self.line_numbers.insert('1.0', line_nums)
+        if num_lines != self.displayed_line_count:
+            self.line_numbers.delete('1.0', 'end')
+            self.line_numbers.insert('1.0', self.line_number_text(num_lines))
+            self.displayed_line_count = num_lines
 
         self.code_text.config(state='disabled')
         self.line_numbers.config(state='disabled')
@@ -944,19 +1297,36 @@ Copies: {record.get('copies', 'N/A')}"""
         self.code_text.yview_moveto(0)
         self.line_numbers.yview_moveto(0)
 
-    def detect_code_type(self, record: Dict[str, Any]) -> Set[str]:
-        """Detect code types based on content and path."""
-        detected_types = set()
-
-        content = str(record.get('content', '')).lower()
+    def line_number_text(self, num_lines: int) -> str:
+        """Gutter text for num_lines lines, sliced from the longest one built so far."""
+        if num_lines > self.line_number_count:
+            self.line_number_cache = '\n'.join(map(str, range(1, num_lines + 1)))
+            self.line_number_count = num_lines
+        # Each number takes its digits plus a newline; the last newline is dropped
+        end = -1
+        digits, first = 1, 1
+        while first <= num_lines:
+            last = min(num_lines, first * 10 - 1)
+            end += (last - first + 1) * (digits + 1)
+            digits += 1
+            first *= 10
+        return self.line_number_cache[:end]
+
+    def detect_code_type(self, record: Dict[str, Any], content: Any = None) -> Set[str]:
+        """Detect code types based on content (str or raw bytes) and path."""
+        if content is None:
+            content = record.get('content', '')
+        if isinstance(content, bytes):
+            import_re, import_to_type = self.IMPORT_BYTES_RE, self.IMPORT_BYTES_TO_TYPE
+        else:
+            import_re, import_to_type = self.IMPORT_RE, self.IMPORT_TO_TYPE
+            content = str(content)
+        content = content[:self.TYPE_SCAN_CHARS].lower()
         path = str(record.get('path', '')).lower()
 
-        for type_name, patterns in self.CODE_TYPE_PATTERNS.items():
-            for imp in patterns['imports']:
-                if imp.lower() in content:
-                    detected_types.add(type_name)
-                    break
+        detected_types = {import_to_type[imp] for imp in import_re.findall(content)}
 
+        for type_name, patterns in self.CODE_TYPE_PATTERNS.items():
             if type_name not in detected_types:
                 for kw in patterns['path_keywords']:
                     if kw.lower() in path:
@@ -967,24 +1337,17 @@ Copies: {record.get('copies', 'N/A')}"""
 
     def get_cached_metrics(self, record_idx: int) -> Dict[str, Any]:
         """Get cached metrics or calculate T1."""
-        if record_idx in self.record_cache:
-            return self.record_cache[record_idx]
-
-        record = self.records[record_idx]
-        cache = self.calculate_t1_metrics(record_idx)
-        return cache
+        cache = self.record_cache.get(record_idx)
+        if cache is not None:
+            return cache
+        return self.calculate_t1_metrics(record_idx)
 
     def calculate_t1_metrics(self, record_idx: int) -> Dict[str, Any]:
         """Calculate Tier 1 metrics (instant)."""
-        record = self.records[record_idx]
-
-        path = record.get('path', '')
+        # Path and size were parsed once into columns when the file was loaded
+        path = self.paths[record_idx]
         name = os.path.basename(path) if path else f'record_{record_idx}'
-
-        try:
-            size = int(record.get('size', 0))
-        except (ValueError, TypeError):
-            size = 0
+        size = self.sizes[record_idx]
 
         if size >= 1024 * 1024:
             size_str = f"{size / (1024 * 1024):.1f} MB"
@@ -1017,12 +1380,19 @@ Copies: {record.get('copies', 'N/A')}"""
             return cache
 
         record = self.records[record_idx]
-        content = record.get('content', '')
+        if isinstance(record, FolderRecord):
+            # Folder file: every T2 metric is computed on the raw bytes, no decode
+            content = self.get_scan_content(record_idx)
+            loc = content.count(b'\n') + 1 if content else 0
+            detected_types = self.detect_code_type(record, content)
+        else:
+            content = record.get('content', '')
+            loc = content.count('\n') + 1 if content else 0
+            detected_types = self.detect_code_type(record, content)
 
-        loc = content.count('\n') + 1 if content else 0
         cache['loc'] = loc
+        self.locs[record_idx] = loc
 
-        detected_types = self.detect_code_type(record)
         if detected_types:
             type_str = ', '.join(sorted(detected_types)[:2])
             if len(detected_types) > 2:
@@ -1031,16 +1401,10 @@ Copies: {record.get('copies', 'N/A')}"""
             type_str = '-'
         cache['type_str'] = type_str
         cache['detected_types'] = detected_types
+        for type_name in detected_types:
+            self.type_postings[type_name].add(record_idx)
 
-        quality_score = self.calculate_basic_quality(content)
-        pct = int((quality_score / self.MAX_QUALITY_SCORE) * 100)
-        if pct >= 70:
-            cache['quality_str'] = f"★★★ {pct}%"
-        elif pct >= 40:
-            cache['quality_str'] = f"★★☆ {pct}%"
-        else:
-            cache['quality_str'] = f"★☆☆ {pct}%"
-        cache['quality_score'] = quality_score
+        self.store_quality(cache, self.calculate_basic_quality(content))
 
         cache['tier'] = 2
         return cache
@@ -1058,8 +1422,7 @@ Copies: {record.get('copies', 'N/A')}"""
         if cache.get('tier', 0) >= 3:
             return cache
 
-        record = self.records[record_idx]
-        content = record.get('content', '')
+        content = self.get_record_content(record_idx)
 
         quality_details = self.calculate_full_quality(content)
         cache['quality_details'] = quality_details
@@ -1068,41 +1431,55 @@ Copies: {record.get('copies', 'N/A')}"""
             self.QUALITY_WEIGHTS.get(k, 0)
             for k, v in quality_details.items() if v
         )
-        pct = int((score / self.MAX_QUALITY_SCORE) * 100)
+        self.store_quality(cache, score)
+        self.quality_generation += 1
+
+        cache['tier'] = 3
+        return cache
 
+    def store_quality(self, cache: Dict[str, Any], score: int):
+        """Store a quality score with its percentage, star bucket and display text."""
+        pct = int((score / self.MAX_QUALITY_SCORE) * 100)
         if pct >= 70:
-            cache['quality_str'] = f"★★★ {pct}%"
+            bucket = '★★★'
         elif pct >= 40:
-            cache['quality_str'] = f"★★☆ {pct}%"
+            bucket = '★★☆'
         else:
-            cache['quality_str'] = f"★☆☆ {pct}%"
+            bucket = '★☆☆'
+        cache['quality_pct'] = pct
+        cache['quality_bucket'] = bucket
+        cache['quality_str'] = f"{bucket} {pct}%"
         cache['quality_score'] = score
 
-        cache['tier'] = 3
-        return cache
-
-    def calculate_basic_quality(self, content: str) -> int:
-        """Quick quality estimate for T2."""
+    def calculate_basic_quality(self, content: Any) -> int:
+        """Quick quality estimate for T2, from str or raw bytes content."""
         if not content:
             return 0
 
+        memo_key = (hash(content), len(content))
+        score = self.basic_quality_memo.get(memo_key)
+        if score is not None:
+            return score
+
         score = 0
+        n = self.BASIC_QUALITY_NEEDLES_BYTES if isinstance(content, bytes) else self.BASIC_QUALITY_NEEDLES
 
-        if '"""' in content or "'''" in content:
+        if n['"""'] in content or n["'''"] in content:
             score += self.QUALITY_WEIGHTS['has_docstring']
 
-        if ': ' in content and '->' in content:
+        if n[': '] in content and n['->'] in content:
             score += self.QUALITY_WEIGHTS['has_type_hints']
 
-        if 'from ' not in content or 'import *' not in content:
+        if n['from '] not in content or n['import *'] not in content:
             score += self.QUALITY_WEIGHTS['no_wildcard_imports']
 
-        if 'def ' in content or 'class ' in content:
+        if n['def '] in content or n['class '] in content:
             score += self.QUALITY_WEIGHTS['has_functions_or_classes']
 
-        if 'eval(' not in content and 'exec(' not in content:
+        if n['eval('] not in content and n['exec('] not in content:
             score += self.QUALITY_WEIGHTS['no_eval_exec']
 
+        self.remember_quality(self.basic_quality_memo, memo_key, score)
         return score
 
     def calculate_full_quality(self, content: str) -> Dict[str, bool]:
@@ -1110,30 +1487,36 @@ Copies: {record.get('copies', 'N/A')}"""
         if not content:
             return {}
 
-        lines = content.split('\n')
+        memo_key = (hash(content), len(content))
+        cached = self.full_quality_memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        num_lines = content.count('\n') + 1
+        line_starts = self.LINE_START_RE.findall(content)
 
         results = {}
 
         results['has_docstring'] = '"""' in content or "'''" in content
 
-        results['has_type_hints'] = bool(re.search(r'def \w+\([^)]*:\s*\w+', content)) or '->' in content
+        results['has_type_hints'] = bool(self.TYPE_HINT_RE.search(content)) or '->' in content
 
-        comment_lines = sum(1 for l in lines if l.strip().startswith('#'))
-        code_lines = sum(1 for l in lines if l.strip() and not l.strip().startswith('#'))
+        comment_lines = list(map(itemgetter(1), line_starts)).count('#')
+        code_lines = len(line_starts) - comment_lines
         if code_lines > 0:
             ratio = comment_lines / code_lines
             results['good_comment_ratio'] = 0.05 <= ratio <= 0.4
         else:
             results['good_comment_ratio'] = False
 
-        long_lines = sum(1 for l in lines if len(l) > 120)
-        results['reasonable_line_length'] = long_lines < len(lines) * 0.1
+        long_lines = len(self.LONG_LINE_RE.findall(content))
+        results['reasonable_line_length'] = long_lines < num_lines * 0.1
 
         results['no_wildcard_imports'] = 'import *' not in content
 
         results['has_functions_or_classes'] = 'def ' in content or 'class ' in content
 
-        identifiers = re.findall(r'\b([a-z_][a-z0-9_]*)\b', content, re.I)
+        identifiers = self.IDENTIFIER_RE.findall(content)
         if identifiers:
             good_names = sum(1 for i in identifiers if len(i) > 1 or i in ('i', 'j', 'k', 'x', 'y', 'n'))
             results['good_naming'] = good_names / len(identifiers) > 0.8
@@ -1146,61 +1529,99 @@ Copies: {record.get('copies', 'N/A')}"""
 
         results['has_exception_handling'] = 'try:' in content and 'except' in content
 
-        nested = max((len(l) - len(l.lstrip())) // 4 for l in lines if l.strip()) if lines else 0
+        nested = max(map(len, map(itemgetter(0), line_starts)), default=0) // 4
         results['reasonable_complexity'] = nested <= 5
 
-        magic_numbers = re.findall(r'[^0-9_]([2-9]\d{2,}|[1-9]\d{3,})[^0-9_]', content)
+        magic_numbers = self.MAGIC_NUMBER_RE.findall(content)
         results['no_magic_numbers'] = len(magic_numbers) < 5
 
+        self.remember_quality(self.full_quality_memo, memo_key, results)
         return results
 
-    def start_background_scan(self):
-        """Start background T2 scanning."""
-        if self.background_scan_active:
-            return
+    def remember_quality(self, memo: Dict[tuple, Any], key: tuple, value: Any):
+        """Store a quality result, resetting the memo once it is full."""
+        if len(memo) >= self.QUALITY_MEMO_SIZE:
+            memo.clear()
+        memo[key] = value
 
+    def start_background_scan(self):
+        """Start background T2 scanning, superseding any scan of earlier records."""
+        self.scan_generation += 1
+        generation = self.scan_generation
         self.background_scan_active = True
         self.background_scan_cancel = False
 
-        thread = threading.Thread(target=self._background_scan_worker, daemon=True)
+        self.scan_progress = None
+        thread = threading.Thread(target=self._background_scan_worker, args=(generation,), daemon=True)
         thread.start()
+        self.after(self.PROGRESS_POLL_MS, self.poll_scan_progress, generation)
+
+    def poll_scan_progress(self, generation: int):
+        """Apply the latest background scan progress until the scan ends."""
+        if generation != self.scan_generation:
+            return  # A newer scan has its own poller
+        latest, self.scan_progress = self.scan_progress, None
+        if self.background_scan_active:
+            if latest is not None:
+                self.on_scan_chunk_done(*latest)
+            self.after(self.PROGRESS_POLL_MS, self.poll_scan_progress, generation)
+        else:
+            self.update_status(f"Indexing complete: {len(self.records)} records")
+            self.refresh_visible_items()
 
-    def _background_scan_worker(self):
+    def _background_scan_worker(self, generation: int):
         """Background worker for T2 metrics."""
         total = len(self.records)
+        record_cache = self.record_cache
+        calculate_t2_metrics = self.calculate_t2_metrics
 
-        for i in range(total):
-            if self.background_scan_cancel:
-                break
-
-            cache = self.record_cache.get(i, {})
-            if cache.get('tier', 0) < 2:
-                self.calculate_t2_metrics(i)
+        try:
+            for chunk_start in range(0, total, self.SCAN_CHUNK_SIZE):
+                if self.background_scan_cancel or generation != self.scan_generation:
+                    break
 
-            if i % 100 == 0:
-                pct = int((i / total) * 100)
-                self.after(0, lambda p=pct, c=i: self.update_status(f"Indexing: {c}/{total} ({p}%)"))
-                self.after(0, self.refresh_visible_items)
+                chunk_end = min(chunk_start + self.SCAN_CHUNK_SIZE, total)
+                for i in range(chunk_start, chunk_end):
+                    # A new load replaces the records under us; stop before touching them
+                    if generation != self.scan_generation:
+                        return
+                    cache = record_cache.get(i)
+                    if cache is None or cache.get('tier', 0) < 2:
+                        calculate_t2_metrics(i)
 
-        self.background_scan_active = False
-        self.after(0, lambda: self.update_status(f"Indexing complete: {total} records"))
-        self.after(0, self.refresh_visible_items)
+                self.scan_progress = (chunk_end, total)
+            else:
+                # Only a scan of the records still loaded may vouch for the type index
+                if generation == self.scan_generation and total == len(self.records):
+                    self.type_index_complete = True
+        finally:
+            # Also on errors, so poll_scan_progress() stops re-arming
+            if generation == self.scan_generation:
+                self.background_scan_active = False
+
+    def on_scan_chunk_done(self, done: int, total: int):
+        """Report background scan progress after a chunk of records."""
+        pct = int((done / total) * 100)
+        self.update_status(f"Indexing: {done}/{total} ({pct}%)")
+        self.refresh_visible_items()
 
     def refresh_visible_items(self):
-        """Refresh currently visible treeview items."""
-        for item_id in self.records_tree.get_children():
+        """Refresh currently visible treeview items whose metrics changed."""
+        for item_id, old_values in list(self.visible_row_values.items()):
+            cache = self.record_cache.get(int(item_id), {})
+            values = (
+                cache.get('name', '?'),
+                cache.get('size_str', '?'),
+                cache.get('loc', '...'),
+                cache.get('type_str', '...'),
+                cache.get('quality_str', '...')
+            )
+            if values == old_values:
+                continue
             try:
-                record_idx = int(item_id)
-                cache = self.record_cache.get(record_idx, {})
-
-                self.records_tree.item(item_id, values=(
-                    cache.get('name', '?'),
-                    cache.get('size_str', '?'),
-                    cache.get('loc', '...'),
-                    cache.get('type_str', '...'),
-                    cache.get('quality_str', '...')
-                ))
-            except (ValueError, tk.TclError):
+                self.records_tree.item(item_id, values=values)
+                self.visible_row_values[item_id] = values
+            except tk.TclError:
                 pass
 
     def sort_tree(self, column: str):
@@ -1211,27 +1632,33 @@ Copies: {record.get('copies', 'N/A')}"""
             self.sort_column = column
             self.sort_reverse = False
 
-        def get_sort_key(idx: int):
-            cache = self.record_cache.get(idx, {})
-            if column == 'name':
-                return cache.get('full_name', '').lower()
-            elif column == 'size':
-                return cache.get('size', 0)
-            elif column == 'loc':
-                loc = cache.get('loc', 0)
-                return loc if isinstance(loc, int) else 0
-            elif column == 'type':
-                return cache.get('type_str', '')
-            elif column == 'quality':
-                return cache.get('quality_score', 0)
-            return ''
+        # Pick the key function once; name, size and LOC come straight from the columns
+        if column == 'name':
+            get_sort_key = self.sort_names.__getitem__
+        elif column == 'size':
+            get_sort_key = self.sizes.__getitem__
+        elif column == 'loc':
+            get_sort_key = self.locs.__getitem__
+        else:
+            field, default = self.CACHE_SORT_FIELDS[column]
+            record_cache = self.record_cache
+            empty: Dict[str, Any] = {}
+
+            def get_sort_key(idx: int):
+                value = record_cache.get(idx, empty).get(field, default)
+                return value if isinstance(value, type(default)) else default
 
+        # Sort the index model, then render only the first page of it
         self.filtered_indices.sort(key=get_sort_key, reverse=self.sort_reverse)
+        self.update_filtered_positions()
+        self.current_page = 0
         self.load_page()
 
     def stop_background_scan(self):
-        """Stop background scanning."""
+        """Stop background scanning; the worker exits after its current chunk."""
         self.background_scan_cancel = True
+        self.scan_generation += 1
+        self.background_scan_active = False
 
     def show_type_filter(self):
         """Show filter by type and size dialog."""
@@ -1328,12 +1755,27 @@ Copies: {record.get('copies', 'N/A')}"""
 
         result_indices = [None]
         is_calculating = [False]
+        rerun_pending = [False]  # Settings changed while a calculation was running
+        preview_after_id = [None]
+        axis_cache: Dict[tuple, Set[int]] = {}  # Per-axis candidate sets by filter setting
+        result_buttons = []  # Act on result_indices, so disabled until the preview is current
+
+        def set_result_buttons_enabled(enabled):
+            try:
+                for button in result_buttons:
+                    button.state(['!disabled'] if enabled else ['disabled'])
+            except tk.TclError:
+                pass  # Dialog closed while a calculation was running
+
+        def cached_axis(key: tuple, build) -> Set[int]:
+            key = (id(self.records), len(self.records)) + key
+            candidates = axis_cache.get(key)
+            if candidates is None:
+                candidates = axis_cache[key] = build()
+            return candidates
 
         def get_size_bytes(size_str):
-            for label, bytes_val in self.SIZE_OPTIONS:
-                if label == size_str:
-                    return bytes_val
-            return 0
+            return self.SIZE_OPTIONS_MAP.get(size_str, 0)
 
         def get_min_quality_pct(quality_str):
             if quality_str == 'Any':
@@ -1347,11 +1789,7 @@ Copies: {record.get('copies', 'N/A')}"""
             return 0
 
         def do_preview_calculation():
-            if is_calculating[0]:
-                return
-            is_calculating[0] = True
-
-            selected_types = [t for t, v in type_vars.items() if v.get()]
+            selected_types = {t for t, v in type_vars.items() if v.get()}
             min_bytes = get_size_bytes(min_size_var.get()) if size_enabled.get() else 0
             max_bytes = get_size_bytes(max_size_var.get()) if size_enabled.get() else float('inf')
             min_quality_pct = get_min_quality_pct(min_quality_var.get()) if quality_enabled.get() else 0
@@ -1360,33 +1798,59 @@ Copies: {record.get('copies', 'N/A')}"""
             type_counts = {t: 0 for t in self.CODE_TYPE_PATTERNS.keys()}
             quality_dist = {'★★★': 0, '★★☆': 0, '★☆☆': 0}
 
-            for i, record in enumerate(self.records):
-                # Size filter
+            check_quality = quality_enabled.get() and min_quality_pct > 0
+
+            if self.type_index_complete:
+                # Every record has T2 metrics: intersect per-axis candidate sets,
+                # each reused until its own setting changes
+                axis_sets = []
                 if size_enabled.get():
-                    try:
-                        size = int(record.get('size', 0))
-                    except (ValueError, TypeError):
-                        size = 0
-                    if size < min_bytes or size > max_bytes:
-                        continue
+                    axis_sets.append(cached_axis(
+                        ('size', min_bytes, max_bytes),
+                        lambda: set(self.indices_in_size_range(min_bytes, max_bytes))))
+                if selected_types:
+                    axis_sets.append(cached_axis(
+                        ('type', frozenset(selected_types)),
+                        lambda: set().union(*(self.type_postings.get(t, ()) for t in selected_types))))
+                if check_quality:
+                    axis_sets.append(cached_axis(
+                        ('quality', min_quality_pct, self.quality_generation),
+                        lambda: {i for i in range(len(self.records))
+                                 if self.record_cache.get(i, {}).get('quality_pct', 0) >= min_quality_pct}))
+                if axis_sets:
+                    axis_sets.sort(key=len)
+                    candidates = sorted(axis_sets[0].intersection(*axis_sets[1:]))
+                else:
+                    candidates = range(len(self.records))
+            elif size_enabled.get():
+                # Size filter: binary search over the pre-sorted size column
+                candidates = self.indices_in_size_range(min_bytes, max_bytes)
+            else:
+                candidates = range(len(self.records))
 
-                # Type filter
-                detected = self.detect_code_type(record)
+            for i in candidates:
+                record = self.records[i]
+                cache = self.record_cache.get(i) or {}
+                scanned = cache.get('tier', 0) >= 2
 
-                if selected_types:
-                    if not detected.intersection(set(selected_types)):
-                        continue
+                # Type filter; reuse T2 results so folder files are not re-read
+                content = None
+                detected = cache.get('detected_types') if scanned else None
+                if detected is None:
+                    content = self.get_scan_content(i)
+                    detected = self.detect_code_type(record, content)
+
+                if selected_types and selected_types.isdisjoint(detected):
+                    continue
 
                 # Quality filter
-                if quality_enabled.get() and min_quality_pct > 0:
-                    cache = self.record_cache.get(i, {})
-                    if cache.get('tier', 0) >= 2:
-                        score = cache.get('quality_score', 0)
-                        pct = int((score / self.MAX_QUALITY_SCORE) * 100)
-                        if pct < min_quality_pct:
+                if check_quality:
+                    if scanned:
+                        if cache.get('quality_pct', 0) < min_quality_pct:
                             continue
                     else:
-                        content = record.get('content', '')
+                        if content is None:
+                            content = self.get_scan_content(i)
                         score = self.calculate_basic_quality(content)
                         pct = int((score / self.MAX_QUALITY_SCORE) * 100)
                         if pct < min_quality_pct:
@@ -1400,24 +1864,25 @@ Copies: {record.get('copies', 'N/A')}"""
                     type_counts[t] += 1
 
                 # Count quality distribution for matched records
-                cache = self.record_cache.get(i, {})
-                if cache.get('tier', 0) >= 2:
-                    score = cache.get('quality_score', 0)
-                    pct = int((score / self.MAX_QUALITY_SCORE) * 100)
-                    if pct >= 70:
-                        quality_dist['★★★'] += 1
-                    elif pct >= 40:
-                        quality_dist['★★☆'] += 1
-                    else:
-                        quality_dist['★☆☆'] += 1
+                if scanned:
+                    quality_dist[cache.get('quality_bucket', '★☆☆')] += 1
 
-            is_calculating[0] = False
             self.after(0, lambda li=local_indices, tc=type_counts, qd=quality_dist: finish_preview(li, tc, qd))
 
         def finish_preview(indices, type_counts, quality_dist):
+            is_calculating[0] = False
+            if rerun_pending[0]:
+                # Skip stale results; recalculate with the latest settings
+                rerun_pending[0] = False
+                start_preview_calculation()
+                return
+            if preview_after_id[0] is not None:
+                return  # Settings changed since; the debounce timer recalculates
+
             result_indices[0] = indices
 
             try:
+                set_result_buttons_enabled(True)
                 preview_text.config(state='normal')
                 preview_text.delete('1.0', 'end')
 
@@ -1449,11 +1914,25 @@ Copies: {record.get('copies', 'N/A')}"""
                 pass
 
         def update_preview(*args):
+            set_result_buttons_enabled(False)
             preview_text.config(state='normal')
             preview_text.delete('1.0', 'end')
             preview_text.insert('1.0', "Calculating...")
             preview_text.config(state='disabled')
 
+            # Debounce: only the last change within PREVIEW_DEBOUNCE_MS is calculated
+            if preview_after_id[0] is not None:
+                self.after_cancel(preview_after_id[0])
+            preview_after_id[0] = self.after(self.PREVIEW_DEBOUNCE_MS, start_preview_calculation)
+
+        def start_preview_calculation():
+            preview_after_id[0] = None
+            set_result_buttons_enabled(False)
+            if is_calculating[0]:
+                rerun_pending[0] = True
+                return
+            is_calculating[0] = True
+
             thread = threading.Thread(target=do_preview_calculation, daemon=True)
             thread.start()
 
@@ -1519,10 +1998,12 @@ Copies: {record.get('copies', 'N/A')}"""
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill='x', pady=10)
 
-        ttk.Button(button_frame, text="✔ Apply Filter",
-                   command=apply_filter).pack(side='left', padx=5)
-        ttk.Button(button_frame, text="💾 Export Filtered",
-                   command=export_filtered, style='Accent.TButton').pack(side='left', padx=5)
+        result_buttons.append(ttk.Button(button_frame, text="✔ Apply Filter",
+                                         command=apply_filter))
+        result_buttons.append(ttk.Button(button_frame, text="💾 Export Filtered",
+                                         command=export_filtered, style='Accent.TButton'))
+        for button in result_buttons:
+            button.pack(side='left', padx=5)
         ttk.Button(button_frame, text="✖ Clear All",
                    command=clear_all, style='Warning.TButton').pack(side='left', padx=5)
         ttk.Button(button_frame, text="Cancel",
@@ -1539,35 +2020,73 @@ Copies: {record.get('copies', 'N/A')}"""
         update_preview()
 
     def apply_syntax_highlighting(self):
-        """Apply Python syntax highlighting to the code text."""
+        """Apply Python syntax highlighting; tag ranges are computed off the UI thread."""
         code = self.code_text.get('1.0', 'end-1c')
+        self.highlight_token += 1
+        token = self.highlight_token
+
+        cache_key = (hash(code), len(code))
+        ranges = self.highlight_cache.get(cache_key)
+        if ranges is not None:
+            self.highlight_cache.move_to_end(cache_key)
+            self.apply_highlight_ranges(token, ranges)
+            return
+
+        def worker():
+            ranges = self.compute_highlight_ranges(code)
+            self.after(0, lambda: self.apply_highlight_ranges(token, ranges, cache_key))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def compute_highlight_ranges(self, code: str) -> Dict[str, List[str]]:
+        """Tag name -> flat [start, end, start, end, ...] Tk indices for code."""
+        line_starts = self.line_start_offsets(code)
+        bisect_right = bisect.bisect_right
+        ranges: Dict[str, List[str]] = {}
+        # Matches arrive in text order, so each line search starts at the previous line
+        line = 0
+        for match in self.HIGHLIGHT_RE.finditer(code):
+            indices = ranges.get(match.lastgroup)
+            if indices is None:
+                indices = ranges[match.lastgroup] = []
+            start, end = match.span()
+            line = bisect_right(line_starts, start, line) - 1
+            indices.append(f"{line + 1}.{start - line_starts[line]}")
+            line = bisect_right(line_starts, end, line) - 1
+            indices.append(f"{line + 1}.{end - line_starts[line]}")
+        return ranges
+
+    def apply_highlight_ranges(self, token: int, ranges: Dict[str, List[str]],
+                               cache_key: Optional[tuple] = None):
+        """Tag the code text, unless another record has been displayed since."""
+        if cache_key is not None:
+            self.highlight_cache[cache_key] = ranges
+            if len(self.highlight_cache) > self.HIGHLIGHT_CACHE_SIZE:
+                self.highlight_cache.popitem(last=False)
+
+        if token != self.highlight_token:
+            return
 
         for tag in ['keyword', 'string', 'comment', 'decorator', 'number', 'builtin']:
             self.code_text.tag_remove(tag, '1.0', 'end')
 
-        for match in re.finditer(r'#.*$', code, re.MULTILINE):
-            self._apply_tag('comment', match.start(), match.end())
-
-        for match in re.finditer(r'("""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"[^"\n]*"|\'[^\'\n]*\')', code):
-            self._apply_tag('string', match.start(), match.end())
+        # Tk's 'tag add' takes any number of index pairs: one call per tag
+        for tag, indices in ranges.items():
+            self.code_text.tag_add(tag, *indices)
 
-        for match in re.finditer(r'@\w+', code):
-            self._apply_tag('decorator', match.start(), match.end())
-
-        for match in re.finditer(r'\b(' + '|'.join(self.PYTHON_KEYWORDS) + r')\b', code):
-            self._apply_tag('keyword', match.start(), match.end())
-
-        for match in re.finditer(r'\b\d+\.?\d*\b', code):
-            self._apply_tag('number', match.start(), match.end())
-
-    def _apply_tag(self, tag: str, start_idx: int, end_idx: int):
-        """Apply a tag to a range of text."""
-        start_pos = f"1.0+{start_idx}c"
-        end_pos = f"1.0+{end_idx}c"
-        self.code_text.tag_add(tag, start_pos, end_pos)
-
-    def get_current_record(self) -> Optional[Dict[str, Any]]:
-        """Get the currently selected record safely."""
+    @staticmethod
+    def line_start_offsets(text: str) -> List[int]:
+        """Character offsets at which each line of text starts."""
+        starts = [0]
+        find = text.find
+        pos = find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        return starts
+
+    def get_current_record_index(self) -> Optional[int]:
+        """Get the index of the currently selected record safely."""
         selection = self.records_tree.selection()
         if not selection:
             return None
@@ -1580,16 +2099,17 @@ Copies: {record.get('copies', 'N/A')}"""
         if record_idx >= len(self.records):
             return None
 
-        return self.records[record_idx]
+        return record_idx
 
     def extract_code(self):
         """Extract code to a file."""
-        record = self.get_current_record()
-        if not record:
+        record_idx = self.get_current_record_index()
+        if record_idx is None:
             messagebox.showwarning("Warning", "No record selected")
             return
 
-        content = record.get('content', '')
+        record = self.records[record_idx]
+        content = self.get_record_content(record_idx)
         if not content:
             messagebox.showwarning("Warning", "No code content to extract")
             return
@@ -1605,8 +2125,7 @@ Copies: {record.get('copies', 'N/A')}"""
 
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self.write_text_file(file_path, content)
                 messagebox.showinfo("Success", f"Code extracted to:\n{file_path}")
                 self.update_status(f"Code extracted to {os.path.basename(file_path)}")
             except Exception as e:
@@ -1614,18 +2133,24 @@ Copies: {record.get('copies', 'N/A')}"""
 
     def copy_code(self):
         """Copy code to clipboard."""
-        record = self.get_current_record()
-        if not record:
+        record_idx = self.get_current_record_index()
+        if record_idx is None:
             messagebox.showwarning("Warning", "No record selected")
             return
 
-        content = record.get('content', '')
-        if content:
+        content = self.get_record_content(record_idx)
+        if not content:
+            messagebox.showwarning("Warning", "No code content to copy")
+            return
+
+        def set_clipboard():
             self.clipboard_clear()
             self.clipboard_append(content)
-            self.update_status("Code copied to clipboard")
-        else:
-            messagebox.showwarning("Warning", "No code content to copy")
+            self.status_bar.config(text="Code copied to clipboard")
+
+        # Let the button release and status repaint before Tk copies a large string
+        self.status_bar.config(text=f"Copying {len(content):,} characters...")
+        self.after_idle(set_clipboard)
 
     def save_code_as(self):
         """Save code as file."""
@@ -1673,46 +2198,83 @@ Copies: {record.get('copies', 'N/A')}"""
         try:
             exported = 0
             errors = 0
-            used_names: Set[str] = set()
-            total = len(indices)
-
-            for i, record_idx in enumerate(indices):
-                record = self.records[record_idx]
-                content = record.get('content', '')
-                if not content:
-                    continue
 
-                original_path = record.get('path', f'code_{i}.py')
-                file_path = self.create_safe_export_path(
-                    folder, original_path, i, used_names
-                )
+            # Phase 1: allocate every target name up front (the only cross-record step)
+            jobs = self.plan_export_paths(folder, indices)
+            total = len(jobs)
 
-                try:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    exported += 1
-                except Exception as e:
-                    errors += 1
-                    print(f"Error exporting {file_path}: {e}")
-
-                if i % 100 == 0:
-                    progress = (i / total) * 100
-                    self.after(0, lambda p=progress: self.progress_var.set(p))
-                    self.update_status(f"Exporting... {i}/{total}")
+            # Phase 2: read and write each batch concurrently
+            with ThreadPoolExecutor(max_workers=self.EXPORT_WORKERS) as executor:
+                for batch_start in range(0, total, self.EXPORT_BATCH_SIZE):
+                    batch = jobs[batch_start:batch_start + self.EXPORT_BATCH_SIZE]
+                    for written in executor.map(self.write_export_file, batch):
+                        if written:
+                            exported += 1
+                        elif written is not None:
+                            errors += 1
 
-            self.after(0, self.hide_progress_bar)
+                    done = batch_start + len(batch)
+                    self.report_progress((done / total) * 100, f"Exporting... {done}/{total}")
 
             result_msg = f"Exported {exported} files to:\n{folder}"
             if errors > 0:
                 result_msg += f"\n\n{errors} files failed to export."
 
-            self.after(0, lambda: messagebox.showinfo("Export Complete", result_msg))
-            self.update_status(f"Exported {exported} code files")
+            def finish():
+                self.hide_progress_bar()
+                self.status_bar.config(text=f"Exported {exported} code files")
+                messagebox.showinfo("Export Complete", result_msg)
+
+            self.after(0, finish)
 
         except Exception as e:
             self.after(0, self.hide_progress_bar)
             self.after(0, lambda: messagebox.showerror("Error", f"Export failed:\n{str(e)}"))
 
+    @staticmethod
+    def write_text_file(file_path: str, content: str):
+        """Write text as UTF-8 with platform newlines, encoded once and written to a raw fd."""
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)
+        data = memoryview(content.encode('utf-8'))
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(file_path, flags, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def plan_export_paths(self, folder: str, indices: List[int]) -> List[tuple]:
+        """(record index, unique target path) for every record with content to export."""
+        used_names: Dict[str, int] = {}
+        jobs = []
+        for i, record_idx in enumerate(indices):
+            record = self.records[record_idx]
+            # Emptiness from metadata, so folder files are not read twice
+            if not (self.sizes[record_idx] if isinstance(record, FolderRecord) else record.get('content')):
+                continue
+
+            original_path = record.get('path', f'code_{i}.py')
+            file_path = self.create_safe_export_path(
+                folder, original_path, i, used_names
+            )
+            jobs.append((record_idx, file_path))
+        return jobs
+
+    def write_export_file(self, job: tuple) -> Optional[bool]:
+        """Write one (record index, file_path) export job; False if it failed, None if empty."""
+        record_idx, file_path = job
+        content = self.get_record_content(record_idx, cache=False)
+        if not content:
+            return None
+        try:
+            self.write_text_file(file_path, content)
+            return True
+        except Exception as e:
+            print(f"Error exporting {file_path}: {e}")
+            return False
+
     def show_search(self):
         """Show search dialog."""
         search_window = tk.Toplevel(self)
@@ -1762,29 +2324,81 @@ Copies: {record.get('copies', 'N/A')}"""
         result_label = ttk.Label(main_frame, text="", foreground='#666666')
         result_label.grid(row=3, column=0, columnspan=2, pady=5)
 
+        def matching_indices(term):
+            """Indices of records whose selected field contains term."""
+            return find_matches(term, search_field.get(), not case_sensitive.get())
+
+        def find_matches(term, field, fold):
+            """Indices of records whose field contains term; safe off the UI thread."""
+            if fold:
+                term = term.casefold()
+
+            if field == 'content':
+                # Contents are too large to keep a second copy of, so they are scanned per search
+                records = self.records
+                if records and isinstance(records[0], FolderRecord):
+                    values = (self.get_record_content(i, cache=False) for i in range(len(records)))
+                else:
+                    values = (str(r.get('content', '')) for r in records)
+                if fold:
+                    return [i for i, value in enumerate(values) if term in value.casefold()]
+                return [i for i, value in enumerate(values) if term in value]
+
+            return self.search_column_matches(self.get_search_column(field, fold), term)
+
+        preview_after_id = [None]
+        preview_token = [0]  # Bumped per preview; older content counts are dropped
+        is_counting = [False]
+        recount_pending = [False]  # Term changed while a content count was running
+
         def preview_search(*args):
             """Preview search results count."""
+            preview_after_id[0] = None
+            if not result_label.winfo_exists():
+                return  # Dialog closed while a preview was pending
+            preview_token[0] += 1
             term = search_entry.get()
             if not term:
                 result_label.config(text=f"Total records: {len(self.records)}")
                 return
 
-            field = search_field.get()
-            search_term = term if case_sensitive.get() else term.lower()
+            field, fold = search_field.get(), not case_sensitive.get()
+            if field != 'content':
+                result_label.config(text=f"Matching records: {len(find_matches(term, field, fold))}")
+                return
+
+            # Content reads every record, and every file of a folder, so count off the UI thread
+            result_label.config(text="Counting matches...")
+            if is_counting[0]:
+                recount_pending[0] = True
+                return
+            is_counting[0] = True
+            token = preview_token[0]
+
+            def count_matches():
+                count = len(find_matches(term, field, fold))
+                self.after(0, lambda: finish_count(token, count))
 
-            count = 0
-            for r in self.records:
-                value = str(r.get(field, ''))
-                if not case_sensitive.get():
-                    value = value.lower()
-                if search_term in value:
-                    count += 1
+            threading.Thread(target=count_matches, daemon=True).start()
 
-            result_label.config(text=f"Matching records: {count}")
+        def finish_count(token, count):
+            is_counting[0] = False
+            if recount_pending[0]:
+                recount_pending[0] = False
+                preview_search()
+                return
+            if token == preview_token[0] and result_label.winfo_exists():
+                result_label.config(text=f"Matching records: {count}")
+
+        def schedule_preview(*args):
+            """Debounce previews so a burst of typing is counted once."""
+            if preview_after_id[0] is not None:
+                self.after_cancel(preview_after_id[0])
+            preview_after_id[0] = self.after(self.SEARCH_DEBOUNCE_MS, preview_search)
 
         # Bind preview to entry changes
-        search_entry.bind('<KeyRelease>', preview_search)
-        search_field.trace('w', preview_search)
+        search_entry.bind('<KeyRelease>', schedule_preview)
+        search_field.trace('w', schedule_preview)
         preview_search()  # Initial preview
 
         # Buttons
@@ -1793,21 +2407,12 @@ Copies: {record.get('copies', 'N/A')}"""
 
         def do_search():
             term = search_entry.get()
-            field = search_field.get()
 
             if not term:
                 self.filtered_indices = list(range(len(self.records)))
                 self.hide_filter_indicator()
             else:
-                search_term = term if case_sensitive.get() else term.lower()
-
-                self.filtered_indices = []
-                for i, r in enumerate(self.records):
-                    value = str(r.get(field, ''))
-                    if not case_sensitive.get():
-                        value = value.lower()
-                    if search_term in value:
-                        self.filtered_indices.append(i)
+                self.filtered_indices = matching_indices(term)
 
                 # Show filter indicator
                 self.show_filter_indicator(term, len(self.filtered_indices))
@@ -1858,28 +2463,18 @@ Copies: {record.get('copies', 'N/A')}"""
         try:
             total = len(self.records)
 
-            total_size = 0
-            for r in self.records:
-                size_val = r.get('size', 0)
-                try:
-                    total_size += int(size_val) if size_val else 0
-                except (ValueError, TypeError):
-                    pass
-
-            licenses: Dict[str, int] = {}
-            for r in self.records:
-                lic = str(r.get('license', 'unknown'))
-                licenses[lic] = licenses.get(lic, 0) + 1
+            # Aggregates only change when a new file is loaded
+            if self.stats_summary is None:
+                self.stats_summary = (
+                    sum(self.sizes),
+                    Counter(self.licenses).most_common(10),
+                    Counter(self.extensions).most_common(10),
+                )
+            total_size, top_licenses, top_extensions = self.stats_summary
 
             avg_size = total_size / total if total > 0 else 0
 
-            extensions: Dict[str, int] = {}
-            for r in self.records:
-                path = r.get('path', '')
-                ext = os.path.splitext(path)[1].lower() or 'no extension'
-                extensions[ext] = extensions.get(ext, 0) + 1
-
-            stats = f"""═══════════════════════════════════════
+            parts = [f"""═══════════════════════════════════════
            REPOSITORY STATISTICS
 ═══════════════════════════════════════
 
@@ -1887,31 +2482,33 @@ Total Records: {total:,}
 Total Code Size: {total_size:,} bytes ({total_size / (1024 * 1024):.2f} MB)
 Average File Size: {avg_size:,.0f} bytes
 
-"""
+"""]
             if self.is_filtered:
-                stats += f"""Currently Filtered: {len(self.filtered_indices):,} records
+                parts.append(f"""Currently Filtered: {len(self.filtered_indices):,} records
 Filter Term: '{self.current_search_term}'
 
-"""
+""")
 
-            stats += """───────────────────────────────────────
+            parts.append("""───────────────────────────────────────
 License Distribution (Top 10):
 ───────────────────────────────────────
-"""
-            for lic, count in sorted(licenses.items(), key=lambda x: x[1], reverse=True)[:10]:
+""")
+            for lic, count in top_licenses:
                 percentage = (count / total) * 100
                 bar = '█' * int(percentage / 5) + '░' * (20 - int(percentage / 5))
-                stats += f"  {lic[:20]:<20} {bar} {count:>6,} ({percentage:>5.1f}%)\n"
+                parts.append(f"  {lic[:20]:<20} {bar} {count:>6,} ({percentage:>5.1f}%)\n")
 
-            stats += """
+            parts.append("""
 ───────────────────────────────────────
 File Extensions (Top 10):
 ───────────────────────────────────────
-"""
-            for ext, count in sorted(extensions.items(), key=lambda x: x[1], reverse=True)[:10]:
+""")
+            for ext, count in top_extensions:
                 percentage = (count / total) * 100
                 bar = '█' * int(percentage / 5) + '░' * (20 - int(percentage / 5))
-                stats += f"  {ext[:20]:<20} {bar} {count:>6,} ({percentage:>5.1f}%)\n"
+                parts.append(f"  {ext[:20]:<20} {bar} {count:>6,} ({percentage:>5.1f}%)\n")
+
+            stats = ''.join(parts)
 
             stats_window = tk.Toplevel(self)
             stats_window.title("Repository Statistics")